@@ -33,6 +33,9 @@ class Account:
 
         self.service: discovery.Resource = self.__authenticate(credentials)
         self._webproperties: list[WebProperty] = []
+        self._webproperties_index: dict[str, WebProperty] = {}
+        # The list the index was built from.
+        self._webproperties_indexed: list[WebProperty] | None = None
 
     def __authenticate(self, credentials: dict) -> discovery.Resource:
         self.cred = Credentials(**credentials)
@@ -76,8 +79,15 @@ class Account:
             self._webproperties = self.webproperties()
 
         if isinstance(item, str):
-            properties = [p for p in self._webproperties if p.url == item]
-            web_property = properties[0] if properties else None
+            # The index follows the list, which may be assigned directly
+            # or extended.
+            if self._webproperties_indexed is not self._webproperties or \
+                    len(self._webproperties_index) != len(self._webproperties):
+                self._webproperties_index = {
+                    p.url: p for p in self._webproperties
+                }
+                self._webproperties_indexed = self._webproperties
+            web_property = self._webproperties_index.get(item)
         else:
             web_property = self._webproperties[item]
 
@@ -98,6 +108,8 @@ class WebProperty:
     <gsc_wrapper.query.Report(rows=...)>
     """
 
+    __slots__ = ("account", "raw", "url", "permission")
+
     permission_levels = {
         "siteFullUser": 1,
         "siteOwner": 2,
@@ -113,7 +125,10 @@ class WebProperty:
 
     def __eq__(self, other):
         if isinstance(self, other.__class__):
-            return self.__dict__ == other.__dict__
+            return all(
+                getattr(self, name) == getattr(other, name)
+                for name in WebProperty.__slots__
+            )
         return False
 
     def __repr__(self):
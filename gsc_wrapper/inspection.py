@@ -1,7 +1,9 @@
 from __future__ import annotations
 import json
+import pathlib
+import pickle
 import time
-from datetime import datetime
+from datetime import date
 from functools import cache, cached_property
 from typing import Self, overload
 from attr import dataclass
@@ -570,24 +572,19 @@ class Report:
         str
             The filename were data was persisteed. An empty string
         """
-        import pathlib
-        import pickle
-        import re
-
         if filename == "":
             # This is calibrated around the webproperty format
-            domain = re.sub(r"[./]", "_", self.webproperty).\
-                replace("__", "_").replace(":", "")
-            filename = datetime.today().strftime("%Y%m%d") + \
+            domain = Util.domain_slug(self.webproperty)
+            filename = Util.date_prefix(date.today().toordinal()) + \
                 "_" + domain + "_inspection.pck"
 
         unique_path = Util.get_filename(pathlib.Path.cwd(), filename)
         try:
-            data = [{"url": self.webproperty}, self.raw]
+            data = ({"url": self.webproperty}, self.raw)
 
-            if unique_path != "":
+            if unique_path:
                 with open(unique_path, "wb") as f:
-                    pickle.dump(data, f)
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
                     return str(unique_path)
             else:
                 return ''
@@ -609,8 +606,6 @@ class Report:
         Report or None
             The unpacked rows.
         """
-        import pickle
-
         if filename != "":
             try:
                 with open(filename, "rb") as f:
@@ -636,8 +631,6 @@ class Report:
         Report or None
             The unpacked rows.
         """
-        import pickle
-
         if data:
             data = pickle.loads(data)
             return cls(data[0]["url"], data[1])
@@ -1,15 +1,53 @@
 from __future__ import annotations
 import collections
-from functools import cache
+import concurrent.futures
+import copy
+from functools import cache, lru_cache, wraps
+from itertools import repeat
+import json
+import pathlib
+import pickle
+import threading
 import time
-from datetime import date
+from datetime import date, timedelta
 from typing import Self, overload
 
+import google_auth_httplib2
 import googleapiclient.errors
+import httplib2
 from dateutil.relativedelta import relativedelta
-from dispatcher import dispatcher
 from gsc_wrapper import enums, account
-from gsc_wrapper.util import Util
+from gsc_wrapper.util import TokenBucket, Util
+
+# Frame header of a Zstandard stream, used to detect compressed reports.
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# File header of the Arrow IPC format, used to detect columnar reports.
+_ARROW_MAGIC = b"ARROW1"
+# Per-thread HTTP connections used by the parallel pagination.
+_local = threading.local()
+# Date offsets used to build the query ranges.
+_ONE_DAY = timedelta(days=1)
+_TWO_DAYS = timedelta(days=2)
+_MAX_HISTORY = relativedelta(months=-16, days=-1)
+
+
+def _copy_on_write(method):
+    """Decorator for the Query methods changing the query: when the query
+    is immutable, the method changes and returns a copy of it."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._immutable:
+            self = copy.copy(self)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@lru_cache(maxsize=64)
+def _row_class(columns: tuple) -> type:
+    """Return the `Row` namedtuple for the given columns, generating the
+    class only once per schema."""
+    return collections.namedtuple("Row", columns)
 
 
 class Query:
@@ -37,6 +75,17 @@ class Query:
     * `filter` to specify which rows to filter by.
     * `limit` to specify a subset of results.
 
+    Parameters
+    ----------
+    webproperty : gsc_wrapper.account.WebProperty
+        The site to query.
+    rate_limit : float
+        The maximum number of requests per second issued by this query.
+        When not given, all queries share a 10 requests per second limit.
+    immutable : bool
+        When True, every method returns a changed copy of the query and
+        leaves the original one untouched. Default to False.
+
     Examples
     --------
     >>> query = Query(site)
@@ -55,28 +104,93 @@ class Query:
     <gsc_wrapper.query.Report(rows=...)>
     """
 
-    _lock = 0
-
-    def __init__(self, webproperty: account.WebProperty | None):
+    __slots__ = (
+        "webproperty",
+        "raw",
+        "_startDate",
+        "_endDate",
+        "_bucket",
+        "_immutable",
+    )
+
+    # Requests throttle shared by all the queries, well within the
+    # Search Analytics quota of 1,200 queries per minute.
+    _shared_bucket = TokenBucket(rate=10, burst=10)
+
+    # Results of `get` shared by all the queries, keyed by the webproperty
+    # and the query body. Entries expire after `_cache_ttl` seconds, and the
+    # least recently used ones are evicted beyond `_cache_rows` rows.
+    # The results are stored serialised, so no caller can alter them.
+    _cache: collections.OrderedDict = collections.OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_rows = 1_000_000
+    _cache_row_count = 0
+    _cache_ttl = 600
+
+    def __init__(
+            self,
+            webproperty: account.WebProperty | None,
+            rate_limit: float | None = None,
+            immutable: bool = False
+    ):
         if not webproperty:
             raise TypeError("A Webproperty is required prior querying data.")
 
         self.webproperty = webproperty
-        self._startDate = date.today() - relativedelta(days=2)
-        self._endDate = date.today() - relativedelta(days=1)
+        # A dedicated throttle, if requested, is not shared with the other
+        # queries.
+        self._bucket = TokenBucket(rate_limit, max(1, int(rate_limit))) \
+            if rate_limit else self._shared_bucket
+        today = date.today()
+        self._startDate = today - _TWO_DAYS
+        self._endDate = today - _ONE_DAY
         self.raw = {
             "startDate": self._startDate.isoformat(),
             "endDate": self._endDate.isoformat(),
             "dataState": "final",
             "aggregationType": "auto",
+            "startRow": 0,
+            "rowLimit": 25000,
         }
-        self.limit(25000)
+        self._immutable = immutable
 
     def __eq__(self, other):
         if isinstance(self, other.__class__):
             return self.raw == other.raw
         return False
 
+    def __copy__(self) -> Query:
+        clone = object.__new__(type(self))
+        for name in Query.__slots__:
+            setattr(clone, name, getattr(self, name))
+
+        # Only the filters list is changed in place, the other values, and
+        # the filters themselves, are replaced: they can be shared.
+        clone.raw = {**self.raw}
+        if "dimensionFilterGroups" in clone.raw:
+            clone.raw["dimensionFilterGroups"] = \
+                clone.raw["dimensionFilterGroups"].copy()
+
+        return clone
+
+    def copy(self) -> Query:
+        """Return a copy of the query which can be changed without
+        affecting the original one, as to branch several queries from
+        a common base.
+
+        Returns
+        -------
+        gsc_wrapper.query.Query
+            A new query with the same settings.
+
+        Examples
+        --------
+        >>> base = Query(site).range(startDate='2022-10-10', days=-7)
+        >>> italy = base.copy().filter(gsc_wrapper.country.ITALY)
+        >>> spain = base.copy().filter(gsc_wrapper.country.SPAIN)
+        """
+        return copy.copy(self)
+
     def __repr__(self):
         return f"<gsc_wrapper.query.Query({self.raw})>"
 
@@ -97,6 +211,7 @@ class Query:
         else:
             return [] if len(_filters) == 0 else _filters[0].get("filters", "")
 
+    @_copy_on_write
     def data_state(
             self,
             data_state: enums.data_state = enums.data_state.FINAL
@@ -135,6 +250,7 @@ class Query:
 
         return self
 
+    @_copy_on_write
     def dimensions(
         self,
         *dimensions: enums.dimension | list[enums.dimension] | tuple[enums.dimension],
@@ -164,44 +280,33 @@ class Query:
         <gsc_wrapper.query.Query(...)>
         """
 
-        if isinstance(dimensions, enums.dimension):
-            # self.raw["dimensions"] = dimensions.value
-            self.raw |= {"dimensions": dimensions.value}
-        elif type(dimensions) is list or tuple:
-            # self.raw["dimensions"] = [
-            #     v.value
-            #     for _, v in enumerate(dimensions)
-            #     if isinstance(v, enums.dimension)
-            # ]
-            self.raw |= {
-                "dimensions": [
-                    v.value
-                    for _, v in enumerate(dimensions)
-                    if isinstance(v, enums.dimension)
-                ],
-            }
-        else:
+        # Dimensions can also be given as a single list or tuple.
+        if len(dimensions) == 1 and isinstance(dimensions[0], (list, tuple)):
+            dimensions = tuple(dimensions[0])
+
+        if not all(isinstance(v, enums.dimension) for v in dimensions):
             raise ValueError("Dimension argument doesn't match the\
                     expected type.")
 
-        if enums.dimension.SEARCH_APPEARANCE in dimensions \
-            and len(dimensions) > 1:
+        values = [v.value for v in dimensions]
+
+        if enums.dimension.SEARCH_APPEARANCE.value in values \
+                and len(values) > 1:
             # SEARCH_APPEARANCE cannot be combined with any other dimensions.
             # Remove it to prevent the executed query throwing an error.
-            self.raw.get("dimensions")\
-                .remove(enums.dimension.SEARCH_APPEARANCE)
+            values.remove(enums.dimension.SEARCH_APPEARANCE.value)
+
+        self.raw |= {"dimensions": values}
 
         return self
 
-    def __filter_remove(self, list, filter: str, expression: str) -> None:
+    def __filter_remove(self, filter: str, expression: str) -> None:
         """Private method to remove a filter assuming it's present in the
         collection.
         The filter name is assumed to be the key item.
 
         Parameters
         ----------
-        list : list
-            the filters collection
         filter : str
             the ID of the filter to remove
         expression : str
@@ -212,14 +317,20 @@ class Query:
         -------
         None
         """
-        if list is not None:
-            for item in list[::-1]:
-                if item.get("filters")[0].get("dimension") == filter:
-                    if (
-                        expression == "ALL"
-                        or item.get("filters")[0].get("expression") == expression
-                    ):
-                        list.remove(item)
+        groups = self.raw.get("dimensionFilterGroups")
+        if not groups:
+            return
+
+        # A single pass keeping the other filters in their order, rather
+        # than a list.remove per match.
+        groups[:] = [
+            item for item in groups
+            if item["filters"][0]["dimension"] != filter
+            or (
+                expression != "ALL"
+                and item["filters"][0]["expression"] != expression
+            )
+        ]
 
     def __filter_build(
             self,
@@ -346,15 +457,18 @@ class Query:
         """
         ...
 
-    @dispatcher
-    def filter(self):
-        """Method not implementated as a fallback to warn developers."""
-        raise NotImplementedError(
-            "The required method signature is not implemented yet."
-        )
+    @_copy_on_write
+    def filter(self, *args, **kwargs):
+        """Dispatch to the country or the dimension filter depending on
+        the type of the first argument."""
+        target = args[0] if args else kwargs.get("country")
+
+        if isinstance(target, enums.country):
+            return self.__filter_country(*args, **kwargs)
 
-    @filter.register
-    def __(
+        return self.__filter_dimension(*args, **kwargs)
+
+    def __filter_dimension(
         self,
         dimension: enums.dimension,
         expression: str,
@@ -372,7 +486,7 @@ class Query:
         # SEARCH_APPEARANCE is a dimension that can be used only at
         # a "metric" level.
         # Prevent the query to return errors by not doing anything.
-        if enums.dimension.SEARCH_APPEARANCE.value in dimension:
+        if dimension is enums.dimension.SEARCH_APPEARANCE:
             return self
 
         # Check for the right data type
@@ -386,17 +500,15 @@ class Query:
 
         # Remove the existing filter if it has been previously used
         if not append:
-            self.__filter_remove(
-                self.raw.get("dimensionFilterGroups"), dimension.value, "ALL"
-            )
+            self.__filter_remove(_dimension, "ALL")
 
         filter = self.__filter_build(_dimension, expression, _operator)
         self.raw.setdefault("dimensionFilterGroups", []).append(filter)
+        self.__validate_query()
 
         return self
 
-    @filter.register
-    def __(
+    def __filter_country(
         self,
         country: enums.country,
         operator: enums.operator = enums.operator.EQUALS,
@@ -420,9 +532,7 @@ class Query:
 
         # Remove the existing filter if it has been previously used
         if not append:
-            self.__filter_remove(
-                self.raw.get("dimensionFilterGroups"), "country", "ALL"
-            )
+            self.__filter_remove("country", "ALL")
 
         filter = self.__filter_build("country", _country, _operator)
         self.raw.setdefault("dimensionFilterGroups", []).append(filter)
@@ -484,25 +594,37 @@ class Query:
         """
         ...
 
-    @dispatcher
-    def filter_remove(self):
-        """Method not implementated as a fallback to warn developers."""
-        raise NotImplementedError("Method not implementated on purpose.")
+    @_copy_on_write
+    def filter_remove(self, *args, **kwargs):
+        """Dispatch to the country or the dimension filter removal
+        depending on the type of the first argument."""
+        target = args[0] if args else kwargs.get("country")
+
+        if isinstance(target, enums.country):
+            return self.__filter_remove_country(*args, **kwargs)
+
+        return self.__filter_remove_dimension(*args, **kwargs)
 
-    @filter_remove.register
-    def __(self, dimension: enums.dimension, expression: str):
+    def __filter_remove_dimension(
+            self,
+            dimension: enums.dimension,
+            expression: str
+    ):
         """Overloaded method to remove the dimension filter."""
-        self.__filter_remove(
-            self.raw.get("dimensionFilterGroups"), dimension.value, expression
-        )
+        if not isinstance(dimension, enums.dimension):
+            raise ValueError("Dimension argument does not match the expected type.")
 
-    @filter_remove.register
-    def __(self, country: enums.country):
+        self.__filter_remove(dimension.value, expression)
+
+        return self
+
+    def __filter_remove_country(self, country: enums.country):
         """Overloaded method to remove the country filter."""
-        self.__filter_remove(
-            self.raw.get("dimensionFilterGroups"), "country", country.value
-        )
+        self.__filter_remove("country", country.value)
 
+        return self
+
+    @_copy_on_write
     def limit(self, *limit):
         """
         Return a query limiting the number of rows returned. It can also
@@ -662,15 +784,15 @@ class Query:
     def __range_build(self, startDate: date, endDate: date):
         # Private method to build the range field
         today = date.today()
-        max_old_date = date.today() + relativedelta(months=-16, days=-1)
+        max_old_date = today + _MAX_HISTORY
 
         # If the datastate require a full data set and the starting date
         # is today, the date is arbitrarily changed.
         if self.raw["dataState"] == enums.data_state.FINAL.value:
             if startDate >= today:
-                startDate = today - relativedelta(days=1)
+                startDate = today - _ONE_DAY
             if endDate >= today:
-                endDate = today - relativedelta(days=1)
+                endDate = today - _ONE_DAY
 
         if startDate < max_old_date:
             startDate = max_old_date
@@ -687,33 +809,36 @@ class Query:
 
         return self
 
-    @dispatcher
-    def range(self):
-        """Range base implementation overload: not implemented on purpose."""
-        raise NotImplementedError("Method not implementated.")
+    @_copy_on_write
+    def range(self, startDate: date | str, *args, **kwargs):
+        """Dispatch to the date range or the date offset overload
+        depending on the type of the second argument."""
+        if isinstance(startDate, str):
+            try:
+                startDate = date.fromisoformat(startDate) if startDate \
+                    else date.today()
+            except ValueError:
+                raise ValueError("The requested date is not in ISO format.")
+        elif not isinstance(startDate, date):
+            raise ValueError("Start date argument does not match the \
+                    expected type.")
 
-    @range.register
-    def __(self, startDate: str, days: int, months: int):
-        """Overload using a date in string forms, and an int days and
-        months version to build the end date."""
+        endDate = args[0] if args else kwargs.get("endDate")
 
-        if startDate == "":
-            startDate = str(date.today())
+        if isinstance(endDate, (date, str)):
+            return self.__range_dates(startDate, endDate)
 
-        try:
-            return self.range.register[("date", "int", "int")](
-                self, date.fromisoformat(startDate), days, months
-            )
-        except Exception:
-            raise ValueError("The requested date is not in ISO format.")
+        return self.__range_offset(startDate, *args, **kwargs)
 
-    @range.register
-    def __(self, startDate: date, days: int = 0, months: int = 0):
+    def __range_offset(self, startDate: date, days: int = 0, months: int = 0):
         """Overload with a date, and integer days and months to build
         the end date."""
 
         # Max start date adjustment will be done later
-        endDate = startDate + relativedelta(days=days, months=months)
+        if months:
+            endDate = startDate + relativedelta(days=days, months=months)
+        else:
+            endDate = startDate + timedelta(days=days)
 
         if days + months < 0:
             # Date swapping to ensure periods validity
@@ -721,21 +846,16 @@ class Query:
 
         return self.__range_build(startDate, endDate)
 
-    @range.register
-    def __(self, startDate: str, endDate: str):
-        """Overload using start and end date as string to build
-        the end date."""
-
-        return self.__range_build(
-            date.fromisoformat(startDate), date.fromisoformat(endDate)
-        )
+    def __range_dates(self, startDate: date, endDate: date | str):
+        """Overloaded using date or ISO string argurments to build the
+        end date."""
 
-    @range.register
-    def __(self, startDate: date, endDate: date):
-        """Overloaded using date argurments to build the end date."""
+        if isinstance(endDate, str):
+            endDate = date.fromisoformat(endDate)
 
         return self.__range_build(startDate, endDate)
 
+    @_copy_on_write
     def search_type(
         self,
         search_type: enums.search_type = enums.search_type.WEB
@@ -770,14 +890,25 @@ class Query:
 
         # self.raw |= {"type": search_type}
         self.raw.setdefault("type", str(search_type))
+        self.__validate_query()
 
         return self
 
-    def get(self) -> Report:
+    def get(self, parallel: int = 1, cache: bool = True) -> Report:
         """Return all the data available for a given query chunking
         the resultset into batches and retrieving the information
         into a report.
 
+        Parameters
+        ----------
+        parallel : int
+            The number of batches requested concurrently, each one on its
+            own HTTP connection. Default to 1 (sequential requests).
+        cache : bool
+            Reuse the results of an identical query run in the last 10
+            minutes, and store these ones. Queries on fresh data, or
+            reaching today, are never cached. Default to True.
+
         Returns
         -------
         gsc_wrapper.query.Report
@@ -788,45 +919,152 @@ class Query:
         >>> query = Query(site)
         >>> query.get()
         <gsc_wrapper.query.Report(rows=...)>
+
+        >>> query.get(parallel=4)
+        <gsc_wrapper.query.Report(rows=...)>
+
+        >>> query.get(cache=False)
+        <gsc_wrapper.query.Report(rows=...)>
         """
+        # The key is built on every call, as the query body is public and
+        # can be changed without going through the methods.
+        key = self.webproperty.url + json.dumps(self.raw, sort_keys=True)
+        # Fresh data keeps changing, hence is always requested again.
+        cache = cache and self.raw["dataState"] != "all" and \
+            date.fromisoformat(self.raw["endDate"]) < date.today()
+        cached = self.__cache_get(key) if cache else None
+
+        if cached:
+            # Fresh copies for every report.
+            return Report(
+                self.webproperty.url,
+                json.loads(cached[1]),
+                json.loads(cached[2]),
+            )
+
         raw_data = []
         startRow = self.raw.get("startRow", 0)
         step = self.raw.get("rowLimit", 25000)
-        chunck_len = 0
-        is_complete = False
-
-        while not is_complete:
-            chunk = self.execute()
+        row = startRow
 
-            if chunk.get("rows"):
-                raw_data += chunk.get("rows")
-                chunck_len = len(raw_data)
-            else:
-                is_complete = True
+        if parallel > 1:
+            raw_data = self.__get_parallel(startRow, step, parallel)
+        else:
+            # Each batch only patches the starting row of the query body,
+            # leaving the query itself untouched.
+            while rows := self.__fetch({**self.raw, "startRow": row})\
+                    .get("rows"):
+                raw_data.extend(rows)
+                # Move to the next "batch"
+                row += step
 
-            # Move to the next "batch"
-            self.raw["startRow"] += step
+        chunck_len = len(raw_data)
 
         # Report stores a copy of the query object for reference.
         # Setting original limits to ensure consistency with the
         # data header.
-        query = self.raw.copy()
+        query = copy.deepcopy(self.raw)
         query["startRow"] = startRow
         query["rowLimit"] = chunck_len
 
-        # Resetting the limit to the original values
-        self.limit(startRow, step)
+        if cache:
+            self.__cache_put(key, query, raw_data)
 
         return Report(self.webproperty.url, query, raw_data)
 
+    def __get_parallel(self, startRow: int, step: int, workers: int) -> list:
+        """Internal method to retrieve the batches `workers` at a time.
+        Batches are requested speculatively and collected in order until
+        an empty one is returned.
+        """
+        def init():
+            # httplib2 connections are not thread safe.
+            _local.http = google_auth_httplib2.AuthorizedHttp(
+                self.webproperty.account.cred, http=httplib2.Http()
+            )
+
+        def fetch(row: int) -> list:
+            body = {**self.raw, "startRow": row}
+            return self.__fetch(body, _local.http).get("rows", [])
+
+        raw_data = []
+
+        with concurrent.futures.ThreadPoolExecutor(
+            workers, initializer=init
+        ) as executor:
+            while True:
+                rows = range(startRow, startRow + workers * step, step)
+                for chunk in executor.map(fetch, rows):
+                    if not chunk:
+                        return raw_data
+                    raw_data.extend(chunk)
+
+                startRow += workers * step
+
+    @staticmethod
+    def __cache_get(key: str) -> tuple | None:
+        """Internal method returning the live cache entry for the given
+        key, if any, after dropping the expired ones."""
+        with Query._cache_lock:
+            now = time.monotonic()
+            for expired in [
+                k for k, entry in Query._cache.items() if entry[0] <= now
+            ]:
+                Query._cache_row_count -= Query._cache.pop(expired)[3]
+
+            entry = Query._cache.get(key)
+            if entry:
+                Query._cache.move_to_end(key)
+
+        return entry
+
+    @staticmethod
+    def __cache_put(key: str, query: dict, rows: list):
+        """Internal method to cache the results of a query, evicting the
+        least recently used entries beyond `_cache_rows` rows."""
+        if len(rows) > Query._cache_rows:
+            return
+
+        entry = (
+            time.monotonic() + Query._cache_ttl,
+            json.dumps(query),
+            json.dumps(rows),
+            len(rows),
+        )
+
+        with Query._cache_lock:
+            if (previous := Query._cache.pop(key, None)) is not None:
+                Query._cache_row_count -= previous[3]
+
+            Query._cache[key] = entry
+            Query._cache_row_count += entry[3]
+
+            while Query._cache_row_count > Query._cache_rows:
+                _, evicted = Query._cache.popitem(last=False)
+                Query._cache_row_count -= evicted[3]
+
+    @classmethod
+    def clear_cache(cls):
+        """Discard all the results cached by `get`, so the next calls
+        will hit the API again.
+
+        Returns
+        -------
+            None
+        """
+        with Query._cache_lock:
+            Query._cache.clear()
+            Query._cache_row_count = 0
+
     def __validate_query(self):
         """Internal method to avoid query errors that could be flagged at
-        run-time."""
+        run-time. It is invoked by the methods changing the query, so the
+        query is always valid when executed."""
 
         # Case 1: Type = GOOGLE_NEWS cannot accet a filter
         # where Dimension is QUERY
         if self.raw.get("type") and "google_news" in self.raw.get("type"):
-            self.__filter_remove(self.raw.get("dimensionFilterGroups"), "query", "ALL")
+            self.__filter_remove("query", "ALL")
 
     def execute(self) -> object:
         """Invoke the API to obtain the raw data as per the specified query.
@@ -836,14 +1074,17 @@ class Query:
         When a larger dataset is expected the get() method should be used
         so the cursor approach kicks-in.
         """
-        self.__validate_query()
+        return self.__fetch(self.raw)
 
+    def __fetch(self, body: dict, http=None) -> dict:
+        """Internal method to run the given query body against the API,
+        optionally on a specific HTTP connection."""
         try:
             self._wait()
             response = (
                 self.webproperty.account.service.searchanalytics()
-                .query(siteUrl=self.webproperty.url, body=self.raw)
-                .execute()
+                .query(siteUrl=self.webproperty.url, body=body)
+                .execute(http=http)
             )
 
         except googleapiclient.errors.HttpError as e:
@@ -852,13 +1093,7 @@ class Query:
         return response
 
     def _wait(self):
-        now = time.time()
-        elapsed = now - self._lock
-        wait = max(0, 1 - elapsed)
-        time.sleep(wait)
-        self._lock = time.time()
-
-        return wait
+        return self._bucket.acquire()
 
 
 class Report:
@@ -899,25 +1134,40 @@ class Report:
     [Row(...), ..., Row(...)]
     """
 
+    __slots__ = (
+        "webproperty",
+        "query",
+        "raw",
+        "dimensions",
+        "metrics",
+        "columns",
+        "row",
+        "rows",
+    )
+
     def __init__(self, webproperty: str, query, raw: list):
         self.webproperty = webproperty
         self.query = query
 
-        if type(raw) is not list and "keys" in raw[0].keys():
+        # Rows carry their dimensions values under "keys", when any.
+        if not isinstance(raw, list) or (
+            raw and query.get("dimensions") and "keys" not in raw[0]
+        ):
             raise TypeError("Raw data is not in the expected format.")
 
         base_metrics = ["clicks", "impressions", "ctr", "position"]
 
         # Not all metrics are supported by all reports types.
-        if self.query.get("search_type") and self.query.get("search_type") in (
-            "discover",
-            "google_news",
+        if self.query.get("type") in (
+            enums.search_type.DISCOVER.value,
+            enums.search_type.GOOGLE_NEWS.value,
         ):
             base_metrics.remove("position")
 
         self.dimensions = self.query.get("dimensions", list())
+        self.metrics = base_metrics
         self.columns = self.dimensions + base_metrics
-        self.row = collections.namedtuple("Row", self.columns)
+        self.row = _row_class(tuple(self.columns))
         self.rows = []
         self.raw = raw
         self._append()
@@ -952,13 +1202,18 @@ class Report:
         return self.rows[-1]
 
     def _append(self):
-        for row in self.raw:
-            row = row.copy()
-            dimensions = dict(zip(self.dimensions, row.pop("keys", [])))
-            self.rows.append(self.row(**dimensions, **row))
+        # Build the rows positionally: dimensions first, then metrics,
+        # as per the columns order.
+        make = self.row._make
+        metrics = self.metrics
+        self.rows.extend(
+            make((*row.get("keys", ()), *(row[m] for m in metrics)))
+            for row in self.raw
+        )
 
-    def to_dict(self) -> dict:
-        return [dict(row._asdict()) for row in self.rows]
+    def to_dict(self) -> list[dict]:
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
 
     @cache
     def to_dataframe(self) -> object:
@@ -971,9 +1226,68 @@ class Report:
             A DataFrame with the flattened rsults.
         """
         import pandas
-        return pandas.DataFrame(self.rows)
 
-    def to_disk(self, filename="") -> str | None:
+        # Transpose the rows once so pandas can infer a type per column.
+        columns = zip(*self.rows) if self.rows else ([] for _ in self.columns)
+        return pandas.DataFrame(dict(zip(self.columns, map(list, columns))))
+
+    def to_arrow(self, filename="", compress: bool = False) -> str | None:
+        """Persist the rows on disk in the Apache Arrow IPC (Feather v2)
+        columnar format. The file can be memory-mapped back with
+        `from_arrow` or read directly by pandas and polars.
+        It requires the `pyarrow` package to be installed.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file where the data will be persisted.
+        compress : bool
+            Compress the columns with Zstandard. Default to False.
+
+        Returns
+        -------
+        str or None
+            The filename were data was persisted
+        """
+        import pyarrow as pa
+
+        if filename == "":
+            domain = Util.domain_slug(self.webproperty)
+            filename = Util.date_prefix(date.today().toordinal()) + \
+                "_" + domain + "query.arrow"
+
+        unique_path = Util.get_filename(pathlib.Path.cwd(), filename)
+
+        columns = list(zip(*self.rows)) or [[] for _ in self.columns]
+        table = pa.Table.from_arrays(
+            [pa.array(column) for column in columns], names=self.columns
+        ).replace_schema_metadata({
+            # The query is needed to rebuild the report dimensions.
+            "gsc_wrapper": json.dumps(
+                {"url": self.webproperty, "query": self.query}
+            )
+        })
+
+        try:
+            with pa.OSFile(str(unique_path), "wb") as sink:
+                options = pa.ipc.IpcWriteOptions(
+                    compression="zstd" if compress else None
+                )
+                with pa.ipc.new_file(
+                    sink, table.schema, options=options
+                ) as writer:
+                    writer.write_table(table)
+                return str(unique_path)
+        except OSError as e:
+            print(f"{type(e)}: {e}")
+            return None
+
+    def to_disk(
+            self,
+            filename="",
+            compress: bool = False,
+            format: str = "pickle"
+    ) -> str | None:
         """Persist the dictionary with the data on disk. If the filename is
         not given, one will be generated automatically.
         A new file with a different suffix will be generated if the given one
@@ -983,29 +1297,52 @@ class Report:
         ----------
         filename : str
             The name of the while where the data will be persisted.
+        compress : bool
+            Compress the data with Zstandard. It requires the `zstandard`
+            package to be installed. Default to False.
+        format : str
+            Either `pickle` (default) or `arrow` to store the rows in the
+            columnar format handled by `to_arrow`.
 
         Returns
         -------
         str or None
             The filename were data was persisteed
         """
-        import pathlib
-        import pickle
-        import re
+        if format == "arrow":
+            return self.to_arrow(filename, compress)
+        elif format != "pickle":
+            raise ValueError("Format argument does not match the expected\
+                    values.")
 
         if filename == "":
             # This is calibrated around the webproperty format
-            domain = re.sub(r"[./]", "_", self.webproperty).replace("__", "_").replace(":", "")
-            filename = date.today().strftime("%Y%m%d") + \
-                "_" + domain + "query.pck"
+            domain = Util.domain_slug(self.webproperty)
+            filename = Util.date_prefix(date.today().toordinal()) + \
+                "_" + domain + "query.pck" + (".zst" if compress else "")
 
         unique_path = Util.get_filename(pathlib.Path.cwd(), filename)
         try:
-            data = [{"url": self.webproperty, "query": self.query}, self.raw]
-
-            if unique_path != "":
-                with open(unique_path, "wb") as f:
-                    pickle.dump(data, f)
+            data = ({"url": self.webproperty, "query": self.query}, self.raw)
+
+            if unique_path:
+                with open(unique_path, "wb", buffering=1 << 20) as f:
+                    if compress:
+                        import zstandard
+
+                        # Rows are highly repetitive (dates, countries,
+                        # devices) and shrink several times over.
+                        cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+                        with cctx.stream_writer(f, closefd=False) as writer:
+                            pickle.dump(
+                                data, writer, protocol=pickle.HIGHEST_PROTOCOL
+                            )
+                    else:
+                        # Rows have a fixed schema: the binary framing of
+                        # the highest protocol is the fastest to load back.
+                        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+                    Util.drop_page_cache(f)
                     return str(unique_path)
             else:
                 return None
@@ -1017,6 +1354,8 @@ class Report:
     def from_disk(cls, filename: str) -> Self | None:
         """Load a file from the disk a previously saved report stored
         with the GSC Wrapper class.
+        The format is detected from the file header, so Zstandard
+        compressed and Arrow IPC files are handled as well.
 
         Parameters
         ----------
@@ -1028,12 +1367,19 @@ class Report:
         Report or None
             The unpacked rows.
         """
-        import pickle
-
         if filename != "":
             try:
                 with open(filename, "rb") as f:
-                    data = pickle.load(f)
+                    if f.peek(6)[:6] == _ARROW_MAGIC:
+                        return cls.from_arrow(filename)
+                    elif f.peek(4)[:4] == _ZSTD_MAGIC:
+                        import zstandard
+
+                        dctx = zstandard.ZstdDecompressor()
+                        with dctx.stream_reader(f) as reader:
+                            data = pickle.load(reader)
+                    else:
+                        data = pickle.load(f)
                     return cls(data[0].get("url"), data[0].get("query"), data[1])
             except OSError as e:
                 raise OSError(f"{type(e)}: {e}")
@@ -1044,6 +1390,7 @@ class Report:
     def from_datastream(cls, data: bytes) -> Self | None:
         """Rebuild the report with the GSC Wrapper class using
         the data stream passed in the argument.
+        The format is detected from the stream header, as in `from_disk`.
 
         Parameters
         ----------
@@ -1055,10 +1402,75 @@ class Report:
         Report or None
             The unpacked rows.
         """
-        import pickle
-
         if data:
+            if data[:6] == _ARROW_MAGIC:
+                import pyarrow as pa
+
+                return cls.__from_arrow_table(pa.ipc.open_file(data).read_all())
+            elif data[:4] == _ZSTD_MAGIC:
+                import zstandard
+
+                data = zstandard.ZstdDecompressor().decompressobj()\
+                    .decompress(data)
             data = pickle.loads(data)
             return cls(data[0]["url"], data[0]["query"], data[1])
 
         return None
+
+    @classmethod
+    def from_arrow(cls, filename: str) -> Self | None:
+        """Load a report previously saved with `to_arrow`.
+        The file is memory-mapped and the rows are rebuilt column by
+        column, without an intermediate Python object per cell.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file used to persist data
+
+        Returns
+        -------
+        Report or None
+            The unpacked rows.
+        """
+        import pyarrow as pa
+
+        if filename != "":
+            try:
+                with pa.memory_map(filename, "r") as source:
+                    return cls.__from_arrow_table(
+                        pa.ipc.open_file(source).read_all()
+                    )
+            except OSError as e:
+                raise OSError(f"{type(e)}: {e}")
+
+        return None
+
+    @classmethod
+    def __from_arrow_table(cls, table) -> Self:
+        """Internal auxiliary method to rebuild the report from an Arrow
+        table written by `to_arrow`.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The table with the rows and the report header in its metadata.
+
+        Returns
+        -------
+            Report
+        """
+        meta = json.loads(table.schema.metadata[b"gsc_wrapper"])
+        dimensions = meta["query"].get("dimensions", [])
+        metrics = [c for c in table.column_names if c not in dimensions]
+
+        # Convert each column once, then zip them back into rows.
+        keys = zip(*(table.column(d).to_pylist() for d in dimensions)) \
+            if dimensions else repeat(())
+        values = zip(*(table.column(m).to_pylist() for m in metrics))
+        raw = [
+            {"keys": list(k), **dict(zip(metrics, v))}
+            for k, v in zip(keys, values)
+        ]
+
+        return cls(meta["url"], meta["query"], raw)
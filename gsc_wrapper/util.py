@@ -1,17 +1,114 @@
+import os
 import pathlib
+import threading
+import time
+from datetime import date
+from functools import lru_cache
+from itertools import count
+
+# Translation table used to turn a webproperty into a filename-safe slug.
+_DOMAIN_TBL = str.maketrans("./", "__", ":")
 
 
 class Util:
     @staticmethod
-    def get_filename(destination: str, filename: str):
-        unique_path = destination / filename
+    @lru_cache(maxsize=4)
+    def date_prefix(ordinal: int) -> str:
+        """Return the `YYYYMMDD` prefix used to name persisted reports.
+        Keyed by the date ordinal so the cached value rolls over at midnight.
+        """
+        return date.fromordinal(ordinal).strftime("%Y%m%d")
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def domain_slug(webproperty: str) -> str:
+        """Return the webproperty as a filename-safe string, as in
+        `https_www_domain_com_` for `https://www.domain.com/`.
+        """
+        return webproperty.translate(_DOMAIN_TBL).replace("__", "_")
+
+    @staticmethod
+    def drop_page_cache(f, threshold: int = 64 << 20):
+        """Advise the OS to evict a freshly written file from the page cache.
+        Large reports are rarely read back by the same process, so caching
+        them only evicts more useful pages. Files smaller than `threshold`
+        bytes, or platforms without `posix_fadvise`, are left untouched.
+        """
+        if not hasattr(os, "posix_fadvise") or f.tell() < threshold:
+            return
+
+        # Only clean pages can be dropped, hence the data has to be synced.
+        f.flush()
+        os.fdatasync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    @staticmethod
+    def get_filename(destination: str, filename: str) -> pathlib.Path:
+        """Return a path to `filename` within `destination` that does not
+        clash with an existing file. On clashes, the smallest free 3-digit
+        counter is added before the extension, as in `report001.pck`.
+        """
+        unique_path = pathlib.Path(destination) / filename
+
+        if unique_path.is_file():
+            base, ext = os.path.splitext(unique_path.name)
+            if ext == ".zst":
+                base, inner = os.path.splitext(base)
+                ext = inner + ext
 
-        if pathlib.Path(unique_path).is_file():
-            filename = filename.replace(".pck", "{:03d}.pck")
-            counter = 0
-            while True:
-                counter += 1
-                if not pathlib.Path(filename.format(counter)).is_file():
-                    break
+            # A single directory scan rather than a stat per counter.
+            existing = {e.name for e in os.scandir(unique_path.parent)}
+            name = next(
+                candidate
+                for candidate in (
+                    f"{base}{counter:03d}{ext}" for counter in count(1)
+                )
+                if candidate not in existing
+            )
+            unique_path = unique_path.with_name(name)
 
         return unique_path
+
+
+class TokenBucket:
+    """A thread-safe token bucket used to throttle the API requests.
+    Up to `burst` requests go through straight away, then requests are
+    spaced so the average rate does not exceed `rate` per second.
+
+    Parameters
+    ----------
+    rate : float
+        The number of tokens added to the bucket per second.
+    burst : int
+        The maximum number of tokens the bucket can hold.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token from the bucket, waiting for one to be available.
+
+        Returns
+        -------
+        float
+            The number of seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            # A negative balance books the token for the waiting caller.
+            self._tokens -= 1
+
+        if wait:
+            time.sleep(wait)
+
+        return wait